@@ -2,25 +2,28 @@
 Main module for bank reviews collection and analysis.
 """
 
-# from .scrape_reviews import scrape_app_reviews
-from .scrape_reviews import ScrapData
-from .clean_reviews import (
-    load_raw_data,
-    remove_duplicates,
-    preprocess_reviews,
-    handle_missing_data,
-    normalize_dates,
-    clean_text
-)
+from importlib import import_module
 
+# Submodules are imported on first attribute access so that loading one stage
+# (e.g. ingestion) does not pull in the scraper, NLP or clustering
+# dependencies.
+_LAZY_IMPORTS = {
+    "load_raw_data": ".clean_reviews",
+    "remove_duplicates": ".clean_reviews",
+    "preprocess_reviews": ".clean_reviews",
+    "iter_review_chunks": ".ingestion",
+    "iter_record_batches": ".ingestion",
+    "load_reviews": ".ingestion",
+    "CANONICAL_COLUMNS": ".ingestion",
+    "ThemeDiscoverer": ".theme_discovery",
+    "discover_themes": ".theme_discovery",
+}
 
-__all__ = [
-    'scrape_app_reviews',
-    'load_raw_data',
-    'remove_duplicates',
-    'preprocess_reviews',
-    'handle_missing_data',
-    'normalize_dates',
-    'clean_text',
-    'ScrapData',
-]
+
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+
+
+__all__ = list(_LAZY_IMPORTS)
@@ -8,12 +8,12 @@ from pathlib import Path
 import re
 import logging
 from datetime import datetime
-import json
+
+from .ingestion import iter_records
 
 def load_raw_data(json_path='raw_reviews.json'):
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    return pd.DataFrame(data)
+    # Keeps the raw scraper columns; use ingestion.load_reviews for the canonical schema
+    return pd.DataFrame.from_records(iter_records(json_path))
 
 def remove_duplicates(df):
     return df.drop_duplicates(subset=['review', 'app'])
@@ -0,0 +1,289 @@
+"""
+Streaming ingestion of raw bank app reviews.
+
+Reads JSON arrays, JSONL and CSV files incrementally in bounded batches and
+maps every source schema onto one canonical review schema, so raw dumps of
+any size can be fed to the downstream stages without renaming columns.
+"""
+
+import csv
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Canonical review schema shared by all downstream stages
+CANONICAL_COLUMNS = ["bank_name", "review_text", "rating", "date", "source"]
+
+CANONICAL_DTYPES = {
+    "bank_name": "string",
+    "review_text": "string",
+    "rating": "Int8",
+    "date": "datetime64[ns]",
+    "source": "string",
+}
+
+# Source column names mapped onto each canonical column, in priority order
+COLUMN_ALIASES = {
+    "bank_name": ["bank_name", "bank", "app_name", "app"],
+    "review_text": ["review_text", "review", "content", "text"],
+    "rating": ["rating", "score"],
+    "date": ["date", "at", "review_date"],
+    "source": ["source"],
+}
+
+DEFAULT_SOURCE = "Google Play"
+MIN_RATING = 1
+MAX_RATING = 5
+DEFAULT_BATCH_SIZE = 10_000
+READ_BLOCK_SIZE = 1 << 20
+MAX_RECORD_SIZE = 16 * READ_BLOCK_SIZE
+TRUNCATION_MARGIN = 16
+
+
+def detect_format(path: Path) -> str:
+    """Detect whether a file holds a JSON array, JSONL records or CSV."""
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if suffix == ".json":
+        # Peek at the first non-blank character rather than trust the suffix
+        with open(path, "r", encoding="utf-8") as f:
+            while True:
+                char = f.read(1)
+                if not char or not char.isspace():
+                    break
+        return "json" if char == "[" else "jsonl"
+    raise ValueError(f"Unsupported review file format: {path}")
+
+
+def _needs_more_input(error: json.JSONDecodeError, buffer: str) -> bool:
+    """Tell a record cut off by the end of the buffer from a corrupt one."""
+    if error.msg.startswith("Unterminated string"):
+        return True
+    # Truncated literals and numbers fail within a few characters of the end
+    return error.pos >= len(buffer) - TRUNCATION_MARGIN
+
+
+def iter_json_array(
+    path: Path,
+    block_size: int = READ_BLOCK_SIZE,
+    max_record_size: int = MAX_RECORD_SIZE,
+) -> Iterator[Any]:
+    """Yield records of a top-level JSON array without reading it all.
+
+    Malformed records raise as soon as they are seen instead of buffering
+    the rest of the file, and no record may exceed `max_record_size`.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    # "open" expects "[", "first" a record or "]", "value" a record after a
+    # comma and "delimiter" a comma or "]" after a record
+    state = "open"
+    records = 0
+
+    with open(path, "r", encoding="utf-8") as f:
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+
+            if pos < len(buffer):
+                char = buffer[pos]
+                if state == "open":
+                    if char != "[":
+                        raise ValueError(f"Expected a JSON array in {path}")
+                    state = "first"
+                    pos += 1
+                    continue
+                if char == "]" and state in ("first", "delimiter"):
+                    return
+                if state == "delimiter":
+                    if char != ",":
+                        raise ValueError(
+                            f"Expected ',' after record {records} in {path}"
+                        )
+                    state = "value"
+                    pos += 1
+                    continue
+
+                try:
+                    record, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as e:
+                    if eof or not _needs_more_input(e, buffer):
+                        where = f"record {records + 1} in {path}"
+                        message = f"Malformed {where}: {e.msg}"
+                        raise ValueError(message) from e
+                else:
+                    # A record ending at the buffer edge may be incomplete
+                    if end < len(buffer) or eof:
+                        yield record
+                        records += 1
+                        pos = end
+                        state = "delimiter"
+                        continue
+
+                if len(buffer) - pos > max_record_size:
+                    raise ValueError(
+                        f"Record {records + 1} in {path} exceeds "
+                        f"{max_record_size} characters"
+                    )
+            elif eof:
+                if state == "open":
+                    return
+                raise ValueError(f"Unterminated JSON array in {path}")
+
+            buffer = buffer[pos:]
+            pos = 0
+            block = f.read(block_size)
+            if block:
+                buffer += block
+            else:
+                eof = True
+
+
+def iter_jsonl(path: Path) -> Iterator[Any]:
+    """Yield records of a JSONL file one line at a time."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                message = f"Skipping malformed line {line_number} in {path}"
+                logger.warning(f"{message}: {str(e)}")
+
+
+def iter_csv(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield records of a CSV file one row at a time."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            # Empty cells are missing values, as in pd.read_csv
+            yield {k: (v if v != "" else None) for k, v in row.items()}
+
+
+def iter_records(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Yield raw review records from a JSON, JSONL or CSV file."""
+    path = Path(path)
+    fmt = detect_format(path)
+    if fmt == "csv":
+        yield from iter_csv(path)
+        return
+
+    records = iter_json_array(path) if fmt == "json" else iter_jsonl(path)
+    for number, record in enumerate(records, start=1):
+        if not isinstance(record, dict):
+            kind = type(record).__name__
+            logger.warning(f"Skipping {kind} record {number} in {path}")
+            continue
+        yield record
+
+
+def resolve_columns(columns: List[str]) -> Dict[str, List[str]]:
+    """Map each canonical column onto the source columns present, in order."""
+    return {
+        canonical: [alias for alias in aliases if alias in columns]
+        for canonical, aliases in COLUMN_ALIASES.items()
+    }
+
+
+def to_canonical(
+    df: pd.DataFrame,
+    bank_name: Optional[str] = None,
+    source: str = DEFAULT_SOURCE,
+) -> pd.DataFrame:
+    """Rename and cast a batch of reviews to the canonical review schema."""
+    columns = CANONICAL_COLUMNS
+    canonical = pd.DataFrame(index=df.index, columns=columns, dtype=object)
+    # Rows from different schemas may share a batch, so fill from every alias
+    for column, aliases in resolve_columns(list(df.columns)).items():
+        for alias in aliases:
+            canonical[column] = canonical[column].combine_first(
+                df[alias].astype(object)
+            )
+
+    if bank_name is not None:
+        canonical["bank_name"] = canonical["bank_name"].fillna(bank_name)
+    canonical["source"] = canonical["source"].fillna(source)
+
+    rating = pd.to_numeric(canonical["rating"], errors="coerce").round()
+    canonical["rating"] = rating.where(rating.between(MIN_RATING, MAX_RATING))
+    dates = canonical["date"]
+    dates = pd.to_datetime(dates, errors="coerce", utc=True, format="mixed")
+    canonical["date"] = dates.dt.tz_convert(None)
+    return canonical.astype(CANONICAL_DTYPES)
+
+
+def iter_review_chunks(
+    path: Union[str, Path],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    bank_name: Optional[str] = None,
+    source: str = DEFAULT_SOURCE,
+) -> Iterator[pd.DataFrame]:
+    """Yield canonical review DataFrames of at most `batch_size` rows."""
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+
+    batch = []
+    total = 0
+    for record in iter_records(path):
+        batch.append(record)
+        if len(batch) >= batch_size:
+            total += len(batch)
+            df = pd.DataFrame.from_records(batch)
+            yield to_canonical(df, bank_name, source)
+            batch = []
+    if batch:
+        total += len(batch)
+        df = pd.DataFrame.from_records(batch)
+        yield to_canonical(df, bank_name, source)
+
+    logger.info(f"Streamed {total} reviews from {path}")
+
+
+def iter_record_batches(
+    path: Union[str, Path],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    bank_name: Optional[str] = None,
+    source: str = DEFAULT_SOURCE,
+) -> Iterator[Any]:
+    """Yield canonical reviews as pyarrow RecordBatches."""
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError("pyarrow is required for Arrow batches") from e
+
+    schema = pa.schema(
+        [
+            ("bank_name", pa.string()),
+            ("review_text", pa.string()),
+            ("rating", pa.int8()),
+            ("date", pa.timestamp("ns")),
+            ("source", pa.string()),
+        ]
+    )
+    for chunk in iter_review_chunks(path, batch_size, bank_name, source):
+        batch = pa.RecordBatch.from_pandas(chunk, schema, preserve_index=False)
+        yield batch
+
+
+def load_reviews(
+    path: Union[str, Path],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    bank_name: Optional[str] = None,
+    source: str = DEFAULT_SOURCE,
+) -> pd.DataFrame:
+    """Load a whole review file into a single canonical DataFrame."""
+    chunks = list(iter_review_chunks(path, batch_size, bank_name, source))
+    if not chunks:
+        return pd.DataFrame(columns=CANONICAL_COLUMNS).astype(CANONICAL_DTYPES)
+    return pd.concat(chunks, ignore_index=True)
@@ -1,14 +1,14 @@
-import pandas as pd
 from preprocessing import preprocess_data
 from sentiment_analysis import SentimentAnalyzer
 from .thematic_analysis import ThemeAnalyzer
 from .config import CONFIG
+from .ingestion import load_reviews
 import json
 
 def run_pipeline():
     # Load data
     print("Loading data...")
-    df = pd.read_csv(CONFIG["DATA_PATH"])
+    df = load_reviews(CONFIG["DATA_PATH"])
     
     # Preprocessing
     df = preprocess_data(df)
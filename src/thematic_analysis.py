@@ -17,6 +17,8 @@ import matplotlib.pyplot as plt
 import spacy
 from ethiopic_nlp import AmharicNLP
 
+from .ingestion import load_reviews
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -48,7 +50,7 @@ THEME_KEYWORDS = {
 def load_data(file_path: Path) -> pd.DataFrame:
     """Load cleaned reviews data."""
     try:
-        df = pd.read_csv(file_path)
+        df = load_reviews(file_path)
         logger.info(f"Loaded {len(df)} reviews from {file_path}")
         return df
     except Exception as e:
@@ -126,8 +128,8 @@ def analyze_themes(df: pd.DataFrame, output_dir: Path):
     # Analyze themes for each bank
     themes_by_bank = []
     
-    for bank in df['app_name'].unique():
-        bank_reviews = df[df['app_name'] == bank]
+    for bank in df['bank_name'].unique():
+        bank_reviews = df[df['bank_name'] == bank]
         
         # Combine all processed reviews for word cloud
         combined_text = ' '.join(bank_reviews['processed_text'])
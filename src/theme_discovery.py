@@ -0,0 +1,514 @@
+"""
+Streaming theme discovery for banking app reviews.
+
+Complements the keyword themes in thematic_analysis by clustering compact
+review vectors with MiniBatchKMeans. Reviews are hashed (so words first seen
+after fitting still count), TF-IDF weighted and randomly projected to a few
+hundred dimensions. Vectors are kept in a float16 memmap on disk, clusters are
+updated with `partial_fit`, and the fitted state is saved to the work
+directory so later runs add new batches without reprocessing history.
+"""
+
+import argparse
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.preprocessing import normalize
+from sklearn.random_projection import SparseRandomProjection
+
+from .ingestion import DEFAULT_BATCH_SIZE, iter_review_chunks
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE = "review_vectors.f16"
+TEXTS_FILE = "review_texts.jsonl"
+STATE_FILE = "theme_state.joblib"
+
+# Run `python -m src.theme_discovery` from the repository root
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_REVIEWS_FILE = REPO_ROOT / "all_reviews_cleaned.csv"
+DEFAULT_WORK_DIR = REPO_ROOT / "data" / "analysis" / "themes"
+DEFAULT_OUTPUT_FILE = REPO_ROOT / "data" / "analysis" / "discovered_themes.csv"
+
+# Cluster id reported for reviews with no usable tokens (emoji, stop words)
+UNASSIGNED = -1
+
+
+class VectorStore:
+    """Append-only float16 matrix backed by a memmap that grows on disk."""
+
+    def __init__(
+        self,
+        path: Path,
+        dim: int,
+        capacity: int = 65_536,
+        size: Optional[int] = None,
+    ):
+        """Create a new store, or reopen one already holding `size` rows."""
+        self.path = Path(path)
+        self.dim = dim
+        row_bytes = dim * np.dtype(np.float16).itemsize
+        if size is None:
+            self.size = 0
+            self.capacity = capacity
+            mode = "w+"
+        else:
+            self.size = size
+            self.capacity = max(self.path.stat().st_size // row_bytes, 1)
+            mode = "r+"
+        self._data = np.memmap(
+            self.path, dtype=np.float16, mode=mode, shape=(self.capacity, dim)
+        )
+
+    def _grow(self, min_capacity: int):
+        capacity = self.capacity
+        while capacity < min_capacity:
+            capacity *= 2
+        self._data.flush()
+        del self._data
+        with open(self.path, "r+b") as f:
+            f.truncate(capacity * self.dim * np.dtype(np.float16).itemsize)
+        self._data = np.memmap(
+            self.path, dtype=np.float16, mode="r+", shape=(capacity, self.dim)
+        )
+        self.capacity = capacity
+
+    def append(self, vectors: np.ndarray):
+        """Append a block of row vectors."""
+        start, end = self.size, self.size + len(vectors)
+        if end > self.capacity:
+            self._grow(end)
+        self._data[start:end] = vectors.astype(np.float16)
+        self.size = end
+
+    def flush(self):
+        self._data.flush()
+
+    def iter_blocks(self, block_size: int) -> Iterable[np.ndarray]:
+        """Yield stored vectors as float32 blocks of at most `block_size`."""
+        self.flush()
+        for start in range(0, self.size, block_size):
+            end = min(start + block_size, self.size)
+            yield np.asarray(self._data[start:end], dtype=np.float32)
+
+
+class ThemeDiscoverer:
+    """Discover review themes incrementally with MiniBatchKMeans."""
+
+    def __init__(
+        self,
+        work_dir: Union[str, Path],
+        n_clusters: int = 12,
+        n_components: int = 256,
+        n_features: int = 2**18,
+        fit_sample_size: int = 20_000,
+        novelty_threshold: float = 0.2,
+        min_novel_reviews: int = 10,
+        random_state: int = 42,
+    ):
+        self.work_dir = Path(work_dir)
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self.params = {
+            "n_clusters": n_clusters,
+            "n_components": n_components,
+            "n_features": n_features,
+            "fit_sample_size": fit_sample_size,
+            "novelty_threshold": novelty_threshold,
+            "min_novel_reviews": min_novel_reviews,
+            "random_state": random_state,
+        }
+        self.n_clusters = n_clusters
+        self.fit_sample_size = fit_sample_size
+        self.novelty_threshold = novelty_threshold
+        self.min_novel_reviews = min_novel_reviews
+
+        self.hasher = HashingVectorizer(
+            n_features=n_features,
+            stop_words="english",
+            ngram_range=(1, 2),
+            alternate_sign=False,
+            norm=None,
+        )
+        self.tfidf = TfidfTransformer(sublinear_tf=True)
+        # Dense enough that every hashed term touches several components
+        self.projection = SparseRandomProjection(
+            n_components=n_components,
+            density=1 / 32,
+            dense_output=True,
+            random_state=random_state,
+        )
+        self.kmeans = MiniBatchKMeans(
+            n_clusters=n_clusters, random_state=random_state, n_init=3
+        )
+        # Reviews assigned to each cluster when they were added
+        self.counts = np.zeros(n_clusters, dtype=np.int64)
+        # Rows already read from each source file, keyed by resolved path
+        self.sources: Dict[str, int] = {}
+        self.store = None
+        self._pending: List[str] = []
+        self._texts_path = self.work_dir / TEXTS_FILE
+        self._texts_bytes = 0
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.store is not None
+
+    def save(self):
+        """Save the fitted state so a later run can keep adding batches."""
+        if self.is_fitted:
+            self.store.flush()
+        state = {
+            "params": self.params,
+            "tfidf": self.tfidf,
+            "projection": self.projection,
+            "kmeans": self.kmeans,
+            "counts": self.counts,
+            "sources": self.sources,
+            "size": self.store.size if self.is_fitted else None,
+            "texts_bytes": self._texts_bytes,
+            "pending": self._pending,
+        }
+        joblib.dump(state, self.work_dir / STATE_FILE)
+        logger.info(f"Saved theme discovery state to {self.work_dir}")
+
+    @classmethod
+    def load(cls, work_dir: Union[str, Path]) -> "ThemeDiscoverer":
+        """Resume from the state saved in `work_dir`.
+
+        Reviews added after the last `save()` are discarded, so vectors and
+        review texts stay aligned.
+        """
+        state = joblib.load(Path(work_dir) / STATE_FILE)
+        discoverer = cls(work_dir, **state["params"])
+        discoverer.tfidf = state["tfidf"]
+        discoverer.projection = state["projection"]
+        discoverer.kmeans = state["kmeans"]
+        discoverer.counts = state["counts"]
+        discoverer.sources = state["sources"]
+        discoverer._pending = state["pending"]
+        discoverer._texts_bytes = state["texts_bytes"]
+        if state["size"] is not None:
+            with open(discoverer._texts_path, "r+b") as f:
+                f.truncate(state["texts_bytes"])
+            discoverer.store = VectorStore(
+                discoverer.work_dir / VECTORS_FILE,
+                discoverer.projection.n_components,
+                size=state["size"],
+            )
+        return discoverer
+
+    def _fit_vectorizer(self, texts: List[str]):
+        """Fit IDF weights on a bounded sample and start a fresh history."""
+        counts = self.hasher.transform(texts)
+        # Hashed terms missing from the sample get the maximum IDF weight
+        self.tfidf.fit(counts)
+        self.projection.fit(counts)
+        self.store = VectorStore(
+            self.work_dir / VECTORS_FILE, self.projection.n_components
+        )
+        self._texts_path.write_text("", encoding="utf-8")
+        self._texts_bytes = 0
+        logger.info(f"Fitted review vectors on {len(texts)} reviews")
+
+    def _weights(self, texts: List[str]):
+        return self.tfidf.transform(self.hasher.transform(texts))
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        vectors = self.projection.transform(self._weights(texts))
+        return normalize(vectors).astype(np.float32)
+
+    def _update(self, texts: List[str]):
+        vectors = self._embed(texts)
+        # Reviews without usable tokens would drag centroids to the origin
+        assigned = vectors[np.linalg.norm(vectors, axis=1) > 0]
+        initialized = hasattr(self.kmeans, "cluster_centers_")
+        if not initialized and len(assigned) < self.n_clusters:
+            raise ValueError(
+                f"Need at least {self.n_clusters} reviews with usable text "
+                f"to discover themes, got {len(assigned)}"
+            )
+        if len(assigned):
+            if initialized:
+                self._reseed_novel(assigned)
+            self.kmeans.partial_fit(assigned)
+            labels = self.kmeans.predict(assigned)
+            self.counts += np.bincount(labels, minlength=self.n_clusters)
+        self.store.append(vectors)
+        lines = "".join(json.dumps(text) + "\n" for text in texts)
+        with open(self._texts_path, "ab") as f:
+            f.write(lines.encode("utf-8"))
+            self._texts_bytes = f.tell()
+
+    def _reseed_novel(self, vectors: np.ndarray):
+        """Give a centroid to a new topic that no existing cluster covers.
+
+        `partial_fit` alone only drags the nearest centroid towards reviews
+        about a new topic. When enough reviews in the batch match no cluster
+        and agree with each other, the two most similar clusters are merged
+        and the freed centroid is reseeded on the new reviews. The model is
+        then re-initialised from these centroids and primed with the cluster
+        sizes, so learning rates reflect how much each centroid has seen.
+        """
+        centers = normalize(self.kmeans.cluster_centers_)
+        similarity = (vectors @ centers.T).max(axis=1)
+        novel = vectors[similarity < self.novelty_threshold]
+        if len(novel) < self.min_novel_reviews:
+            return
+        seed = novel.mean(axis=0)
+        if np.linalg.norm(seed) < self.novelty_threshold:
+            return
+
+        seed_similarity = (normalize(seed[np.newaxis]) @ centers.T).max()
+        pairs = centers @ centers.T
+        np.fill_diagonal(pairs, -np.inf)
+        keep, free = np.unravel_index(pairs.argmax(), pairs.shape)
+        if pairs[keep, free] <= seed_similarity:
+            return
+
+        centers = self.kmeans.cluster_centers_.copy()
+        weights = self.counts[[keep, free]].astype(np.float64)
+        if weights.sum() > 0:
+            merged = np.average(centers[[keep, free]], axis=0, weights=weights)
+            centers[keep] = merged
+        centers[free] = seed
+        self.counts[keep] += self.counts[free]
+        self.counts[free] = 0
+
+        ratio = self.kmeans.reassignment_ratio
+        # Floor the weights so the first step does not reassign any centroid
+        sizes = np.maximum(self.counts, max(ratio * self.counts.max(), 1))
+        self.kmeans = MiniBatchKMeans(
+            n_clusters=self.n_clusters,
+            init=centers,
+            n_init=1,
+            random_state=self.params["random_state"],
+        )
+        self.kmeans.partial_fit(centers, sample_weight=sizes)
+        logger.info(
+            f"Merged cluster {free} into {keep} and reseeded it on "
+            f"{len(novel)} reviews about a new topic"
+        )
+
+    def partial_fit(self, texts: Iterable[str]) -> "ThemeDiscoverer":
+        """Add a batch of reviews and update the clusters."""
+        texts = [t.strip() for t in texts if isinstance(t, str) and t.strip()]
+        if not self.is_fitted:
+            # Buffer reviews until there are enough to fit the vectorizer
+            self._pending.extend(texts)
+            if len(self._pending) >= self.fit_sample_size:
+                self.flush()
+            return self
+        if texts:
+            self._update(texts)
+        return self
+
+    def flush(self) -> "ThemeDiscoverer":
+        """Fit on buffered reviews even if the sample is smaller than asked."""
+        if self.is_fitted or not self._pending:
+            return self
+        pending, self._pending = self._pending, []
+        self._fit_vectorizer(pending)
+        for start in range(0, len(pending), DEFAULT_BATCH_SIZE):
+            end = start + DEFAULT_BATCH_SIZE
+            self._update(pending[start:end])
+        return self
+
+    def _iter_text_blocks(self, block_size: int) -> Iterable[List[str]]:
+        with open(self._texts_path, "r", encoding="utf-8") as f:
+            block = []
+            for line in f:
+                block.append(json.loads(line))
+                if len(block) == block_size:
+                    yield block
+                    block = []
+            if block:
+                yield block
+
+    def _resolve_terms(self, wanted: set, block_size: int) -> Dict[int, str]:
+        """Map hashed feature indices back to the terms that produced them."""
+        analyzer = self.hasher.build_analyzer()
+        hasher = FeatureHasher(
+            n_features=self.hasher.n_features,
+            input_type="string",
+            alternate_sign=False,
+        )
+        terms = {}
+        for texts in self._iter_text_blocks(block_size):
+            tokens = sorted({t for text in texts for t in analyzer(text)})
+            if tokens:
+                indices = hasher.transform([[t] for t in tokens]).indices
+                for token, index in zip(tokens, indices):
+                    if index in wanted and index not in terms:
+                        terms[index] = token
+            if len(terms) == len(wanted):
+                break
+        return terms
+
+    def summarize(
+        self,
+        top_n_terms: int = 10,
+        n_representatives: int = 3,
+        block_size: int = DEFAULT_BATCH_SIZE,
+    ) -> pd.DataFrame:
+        """Describe each cluster by size, top terms and closest reviews.
+
+        Reviews with no usable tokens are reported under cluster -1.
+        """
+        self.flush()
+        if not self.is_fitted:
+            raise ValueError("No reviews have been added")
+
+        k = self.n_clusters
+        sizes = np.zeros(k, dtype=np.int64)
+        term_sums = np.zeros((k, self.hasher.n_features), dtype=np.float32)
+        best_dist = np.full((k, n_representatives), np.inf)
+        best_text = [[None] * n_representatives for _ in range(k)]
+        unassigned = []
+        n_unassigned = 0
+
+        # One pass over the memmap and the texts, in lockstep
+        blocks = zip(
+            self.store.iter_blocks(block_size),
+            self._iter_text_blocks(block_size),
+        )
+        for vectors, texts in blocks:
+            usable = np.linalg.norm(vectors, axis=1) > 0
+            rows = np.flatnonzero(~usable)
+            n_unassigned += len(rows)
+            missing = n_representatives - len(unassigned)
+            unassigned.extend(texts[i] for i in rows[:missing])
+
+            rows = np.flatnonzero(usable)
+            if not len(rows):
+                continue
+            labels = self.kmeans.predict(vectors[rows])
+            dist = self.kmeans.transform(vectors[rows])
+            dist = dist[np.arange(len(rows)), labels]
+            weights = self._weights([texts[i] for i in rows])
+            sizes += np.bincount(labels, minlength=k)
+
+            for cluster in np.unique(labels):
+                members = np.flatnonzero(labels == cluster)
+                term_sums[cluster] += weights[members].sum(axis=0).A1
+                cand_dist = np.concatenate([best_dist[cluster], dist[members]])
+                members_text = [texts[rows[i]] for i in members]
+                cand_text = best_text[cluster] + members_text
+                keep = np.argsort(cand_dist, kind="stable")[:n_representatives]
+                best_dist[cluster] = cand_dist[keep]
+                best_text[cluster] = [cand_text[i] for i in keep]
+
+        top_indices = [
+            [
+                i
+                for i in term_sums[c].argsort()[::-1][:top_n_terms]
+                if term_sums[c, i] > 0
+            ]
+            for c in range(k)
+        ]
+        wanted = {i for indices in top_indices for i in indices}
+        terms = self._resolve_terms(wanted, block_size)
+
+        clusters = [
+            {
+                "cluster": cluster,
+                "size": int(sizes[cluster]),
+                "top_terms": [terms[i] for i in top_indices[cluster]],
+                "representative_reviews": [
+                    t for t in best_text[cluster] if t is not None
+                ],
+            }
+            for cluster in range(k)
+        ]
+        themes = pd.DataFrame(clusters).sort_values(
+            "size", ascending=False, ignore_index=True
+        )
+        if n_unassigned:
+            bucket = {
+                "cluster": UNASSIGNED,
+                "size": n_unassigned,
+                "top_terms": [],
+                "representative_reviews": unassigned,
+            }
+            bucket = pd.DataFrame([bucket])
+            themes = pd.concat([themes, bucket], ignore_index=True)
+        return themes
+
+
+def discover_themes(
+    path: Union[str, Path],
+    work_dir: Union[str, Path],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    discoverer: Optional[ThemeDiscoverer] = None,
+    **kwargs: Any,
+) -> pd.DataFrame:
+    """Stream a review file through theme discovery and summarize clusters.
+
+    Resumes from any state saved in `work_dir` by an earlier run. Rows of
+    `path` that an earlier run already added are skipped, so only reviews
+    appended to the file since then are new.
+    """
+    if discoverer is None:
+        if (Path(work_dir) / STATE_FILE).exists():
+            discoverer = ThemeDiscoverer.load(work_dir)
+            conflicts = {
+                name: value
+                for name, value in kwargs.items()
+                if discoverer.params.get(name) != value
+            }
+            if conflicts:
+                raise ValueError(
+                    f"{conflicts} conflict with the parameters saved in "
+                    f"{work_dir}: {discoverer.params}"
+                )
+        else:
+            discoverer = ThemeDiscoverer(work_dir, **kwargs)
+
+    source = str(Path(path).resolve())
+    seen = discoverer.sources.get(source, 0)
+    rows = 0
+    for chunk in iter_review_chunks(path, batch_size=batch_size):
+        skip = max(seen - rows, 0)
+        rows += len(chunk)
+        if skip < len(chunk):
+            discoverer.partial_fit(chunk["review_text"].iloc[skip:].dropna())
+    discoverer.sources[source] = max(seen, rows)
+    discoverer.flush()
+    discoverer.save()
+    return discoverer.summarize()
+
+
+def main():
+    """Main function to discover review themes."""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        "reviews",
+        nargs="?",
+        type=Path,
+        default=DEFAULT_REVIEWS_FILE,
+    )
+    parser.add_argument("--work-dir", type=Path, default=DEFAULT_WORK_DIR)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT_FILE)
+    args = parser.parse_args()
+
+    try:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        themes_df = discover_themes(args.reviews, args.work_dir)
+        themes_df.to_csv(args.output, index=False)
+
+        logger.info("Theme discovery completed successfully")
+
+    except Exception as e:
+        logger.error(f"Error in theme discovery: {str(e)}")
+        raise
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Tests for the ingestion module.
+"""
+
+import json
+import pandas as pd
+import pytest
+from src.ingestion import (
+    CANONICAL_COLUMNS,
+    iter_json_array,
+    iter_record_batches,
+    iter_records,
+    iter_review_chunks,
+    load_reviews,
+)
+
+RECORDS = [
+    {
+        "app": "CBE",
+        "review": "So bad now",
+        "rating": 1,
+        "date": "2025-06-09T18:31:56",
+    },
+    {
+        "app": "BOA",
+        "review": "Great app",
+        "rating": 5,
+        "date": "2025-06-08T10:00:00",
+    },
+    {
+        "app": "Dashen",
+        "review": "Okay",
+        "rating": 3,
+        "date": "2025-06-07T09:15:00",
+    },
+]
+
+
+def write_jsonl(path, records):
+    lines = [json.dumps(r) for r in records]
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+
+def test_iter_json_array_small_blocks(tmp_path):
+    path = tmp_path / "reviews.json"
+    path.write_text(json.dumps(RECORDS, indent=2), encoding="utf-8")
+    assert list(iter_json_array(path, block_size=7)) == RECORDS
+
+
+def test_iter_json_array_requires_commas(tmp_path):
+    path = tmp_path / "reviews.json"
+    path.write_text('[{"review": "x"} {"review": "y"}]', encoding="utf-8")
+    with pytest.raises(ValueError, match="Expected ','"):
+        list(iter_json_array(path))
+
+
+def test_iter_json_array_fails_fast_on_malformed_record(tmp_path):
+    path = tmp_path / "reviews.json"
+    tail = ", ".join(json.dumps(r) for r in RECORDS * 100)
+    path.write_text('[{"review": oops}, ' + tail + "]", encoding="utf-8")
+    with pytest.raises(ValueError, match="Malformed record 1"):
+        list(iter_json_array(path, block_size=16))
+
+
+def test_iter_json_array_caps_record_size(tmp_path):
+    path = tmp_path / "reviews.json"
+    path.write_text('[{"review": "' + "x" * 200, encoding="utf-8")
+    with pytest.raises(ValueError, match="exceeds 64 characters"):
+        list(iter_json_array(path, block_size=16, max_record_size=64))
+
+
+def test_iter_records_skips_non_object_records(tmp_path):
+    path = tmp_path / "reviews.json"
+    path.write_text('[1, [2], {"review": "x"}]', encoding="utf-8")
+    assert list(iter_records(path)) == [{"review": "x"}]
+
+
+def test_iter_review_chunks_batches(tmp_path):
+    path = tmp_path / "reviews.jsonl"
+    write_jsonl(path, RECORDS)
+    chunks = list(iter_review_chunks(path, batch_size=2))
+    assert [len(c) for c in chunks] == [2, 1]
+    assert all(list(c.columns) == CANONICAL_COLUMNS for c in chunks)
+
+
+def test_load_reviews_unifies_schemas(tmp_path):
+    csv_path = tmp_path / "reviews.csv"
+    pd.DataFrame(
+        {
+            "bank": ["CBE"],
+            "review": ["So bad now"],
+            "rating": [1],
+            "date": ["2025-06-09"],
+            "source": ["Google Play"],
+        }
+    ).to_csv(csv_path, index=False)
+    json_path = tmp_path / "reviews.json"
+    json_path.write_text(json.dumps(RECORDS[:1]), encoding="utf-8")
+
+    from_csv = load_reviews(csv_path)
+    from_json = load_reviews(json_path)
+
+    for df in (from_csv, from_json):
+        assert list(df.columns) == CANONICAL_COLUMNS
+        assert df["bank_name"].iloc[0] == "CBE"
+        assert df["review_text"].iloc[0] == "So bad now"
+        assert df["rating"].iloc[0] == 1
+        assert df["source"].iloc[0] == "Google Play"
+        assert str(df["rating"].dtype) == "Int8"
+
+
+def test_load_reviews_timezone_aware_dates(tmp_path):
+    path = tmp_path / "reviews.jsonl"
+    records = [
+        {
+            "app": "CBE",
+            "review": "a",
+            "rating": 1,
+            "date": "2025-06-09T18:31:56Z",
+        },
+        {
+            "app": "BOA",
+            "review": "b",
+            "rating": 2,
+            "date": "2025-06-09T18:31:56+03:00",
+        },
+    ]
+    write_jsonl(path, records)
+
+    df = load_reviews(path)
+
+    assert str(df["date"].dtype) == "datetime64[ns]"
+    assert df["date"].iloc[0] == pd.Timestamp("2025-06-09 18:31:56")
+    assert df["date"].iloc[1] == pd.Timestamp("2025-06-09 15:31:56")
+
+
+def test_load_reviews_out_of_range_rating(tmp_path):
+    path = tmp_path / "reviews.csv"
+    pd.DataFrame(
+        {
+            "bank": ["CBE", "BOA", "Dashen"],
+            "review": ["a", "b", "c"],
+            "rating": [300, 0, 4],
+        }
+    ).to_csv(path, index=False)
+
+    ratings = load_reviews(path)["rating"]
+
+    assert ratings.isna().tolist() == [True, True, False]
+    assert ratings.iloc[2] == 4
+
+
+def test_load_reviews_mixed_schemas_in_one_batch(tmp_path):
+    path = tmp_path / "reviews.jsonl"
+    records = [
+        {"app": "CBE", "review": "from scraper"},
+        {"bank_name": "BOA", "review_text": "from analysis"},
+    ]
+    write_jsonl(path, records)
+
+    df = load_reviews(path)
+
+    assert df["bank_name"].tolist() == ["CBE", "BOA"]
+    assert df["review_text"].tolist() == ["from scraper", "from analysis"]
+
+
+def test_iter_record_batches(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    path = tmp_path / "reviews.jsonl"
+    write_jsonl(path, RECORDS)
+
+    batches = list(iter_record_batches(path, batch_size=2))
+
+    assert [b.num_rows for b in batches] == [2, 1]
+    assert batches[0].schema.names == CANONICAL_COLUMNS
+    assert batches[0].schema.field("rating").type == pa.int8()
+    assert batches[0].column("bank_name").to_pylist() == ["CBE", "BOA"]
@@ -0,0 +1,163 @@
+"""
+Tests for the theme_discovery module.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.theme_discovery import (
+    UNASSIGNED,
+    ThemeDiscoverer,
+    VectorStore,
+    discover_themes,
+)
+
+LOGIN_REVIEWS = [
+    "login password rejected every time",
+    "cannot login, password reset fails",
+    "password login keeps failing",
+] * 10
+CRASH_REVIEWS = [
+    "app crashes on startup",
+    "crash after update, app freezes",
+    "keeps crashing and freezing",
+] * 10
+OTP_REVIEWS = [
+    "otp code never arrives",
+    "sms otp delayed, otp expired",
+    "no otp message received",
+] * 10
+FEE_REVIEWS = [
+    "internet fees too high",
+    "charged internet fees twice",
+] * 15
+
+
+def test_vector_store_grows(tmp_path):
+    store = VectorStore(tmp_path / "vectors.f16", dim=4, capacity=2)
+    store.append(np.ones((5, 4)))
+    blocks = list(store.iter_blocks(block_size=3))
+    assert store.size == 5
+    assert [len(b) for b in blocks] == [3, 2]
+    assert blocks[0].dtype == np.float32
+
+
+def test_vector_store_reopens_for_append(tmp_path):
+    path = tmp_path / "vectors.f16"
+    store = VectorStore(path, dim=4, capacity=2)
+    store.append(np.ones((2, 4)))
+    store.flush()
+
+    reopened = VectorStore(path, dim=4, size=2)
+    reopened.append(np.zeros((3, 4)))
+
+    vectors = np.concatenate(list(reopened.iter_blocks(block_size=10)))
+    assert vectors.shape == (5, 4)
+    assert vectors[:2].sum() == 8 and vectors[2:].sum() == 0
+
+
+def test_discovers_topic_introduced_after_fit(tmp_path):
+    discoverer = ThemeDiscoverer(
+        tmp_path, n_clusters=3, n_components=64, fit_sample_size=60
+    )
+    discoverer.partial_fit(LOGIN_REVIEWS + CRASH_REVIEWS)
+    assert discoverer.is_fitted
+    for start in range(0, len(OTP_REVIEWS), 10):
+        end = start + 10
+        discoverer.partial_fit(OTP_REVIEWS[start:end])
+
+    themes = discoverer.summarize(top_n_terms=3, n_representatives=2)
+
+    otp = themes[themes["top_terms"].apply(lambda terms: "otp" in terms)]
+    assert len(otp) == 1
+    assert otp["size"].iloc[0] == len(OTP_REVIEWS)
+    assert themes["size"].sum() == 90
+
+
+def test_reviews_without_tokens_are_unassigned(tmp_path):
+    discoverer = ThemeDiscoverer(
+        tmp_path, n_clusters=2, n_components=64, fit_sample_size=60
+    )
+    discoverer.partial_fit(LOGIN_REVIEWS + CRASH_REVIEWS)
+    discoverer.partial_fit(["👍👍", "😡", "it is the", "!!!"])
+
+    themes = discoverer.summarize(n_representatives=2)
+
+    bucket = themes[themes["cluster"] == UNASSIGNED].iloc[0]
+    assert bucket["size"] == 4
+    assert bucket["top_terms"] == []
+    assert bucket["representative_reviews"] == ["👍👍", "😡"]
+    assert themes[themes["cluster"] != UNASSIGNED]["size"].sum() == 60
+
+
+def test_resumes_from_saved_state(tmp_path):
+    discoverer = ThemeDiscoverer(
+        tmp_path, n_clusters=3, n_components=64, fit_sample_size=60
+    )
+    discoverer.partial_fit(LOGIN_REVIEWS + CRASH_REVIEWS)
+    discoverer.save()
+
+    resumed = ThemeDiscoverer.load(tmp_path)
+    resumed.partial_fit(FEE_REVIEWS)
+    themes = resumed.summarize(top_n_terms=3)
+
+    assert themes["size"].sum() == 90
+    assert any("fees" in terms for terms in themes["top_terms"])
+
+
+def test_resume_discards_unsaved_batch(tmp_path):
+    discoverer = ThemeDiscoverer(
+        tmp_path, n_clusters=3, n_components=64, fit_sample_size=60
+    )
+    discoverer.partial_fit(LOGIN_REVIEWS + CRASH_REVIEWS)
+    discoverer.save()
+    discoverer.partial_fit(OTP_REVIEWS)
+
+    resumed = ThemeDiscoverer.load(tmp_path)
+    resumed.partial_fit(FEE_REVIEWS)
+    themes = resumed.summarize(top_n_terms=3)
+
+    assert themes["size"].sum() == 90
+    fees = themes[themes["top_terms"].apply(lambda terms: "fees" in terms)]
+    assert all("fee" in r for r in fees["representative_reviews"].iloc[0])
+    assert not any("otp" in terms for terms in themes["top_terms"])
+
+
+def test_discover_themes_skips_rows_already_added(tmp_path):
+    path = tmp_path / "reviews.csv"
+    reviews = LOGIN_REVIEWS + CRASH_REVIEWS
+    pd.DataFrame({"bank": "CBE", "review": reviews}).to_csv(path, index=False)
+    params = {"n_clusters": 2, "n_components": 64, "fit_sample_size": 20}
+
+    first = discover_themes(path, tmp_path / "themes", **params)
+    again = discover_themes(path, tmp_path / "themes")
+    pd.DataFrame({"bank": "CBE", "review": reviews + FEE_REVIEWS}).to_csv(
+        path, index=False
+    )
+    grown = discover_themes(path, tmp_path / "themes")
+
+    assert first["size"].sum() == again["size"].sum() == 60
+    assert grown["size"].sum() == 90
+
+
+def test_discover_themes_rejects_conflicting_params(tmp_path):
+    path = tmp_path / "reviews.csv"
+    reviews = LOGIN_REVIEWS + CRASH_REVIEWS
+    pd.DataFrame({"bank": "CBE", "review": reviews}).to_csv(path, index=False)
+    discover_themes(path, tmp_path / "themes", n_clusters=2)
+
+    with pytest.raises(ValueError, match="conflict"):
+        discover_themes(path, tmp_path / "themes", n_clusters=5)
+
+
+def test_reseeded_cluster_takes_new_topic(tmp_path):
+    discoverer = ThemeDiscoverer(
+        tmp_path, n_clusters=3, n_components=64, fit_sample_size=60
+    )
+    discoverer.partial_fit(LOGIN_REVIEWS + CRASH_REVIEWS)
+    discoverer.partial_fit(OTP_REVIEWS)
+
+    labels = discoverer.kmeans.predict(discoverer._embed(OTP_REVIEWS))
+    assert len(set(labels)) == 1
+    # The reseeded centroid starts light, so the new topic moved it fully
+    assert discoverer.counts[labels[0]] == len(OTP_REVIEWS)